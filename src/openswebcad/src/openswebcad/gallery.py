@@ -0,0 +1,47 @@
+import json
+import math
+
+from openswebcad.parameters import Parameter, IntParameter, FloatParameter, ChoiceParameter
+
+def sweep_values(parameter: Parameter, count: int) -> list:
+    """Values to compare for a parameter: all choices, or `count` evenly spaced numbers in its range."""
+    if isinstance(parameter, ChoiceParameter):
+        return list(parameter.choices)
+    if isinstance(parameter, (IntParameter, FloatParameter)):
+        if count < 2:
+            return [parameter.min_value]
+        step = (parameter.max_value - parameter.min_value) / (count - 1)
+        values = [parameter.min_value + i * step for i in range(count)]
+        if isinstance(parameter, IntParameter):
+            return sorted(set(round(v) for v in values))
+        return values
+    raise NotImplementedError()
+
+def _is_use(line: str) -> bool:
+    return line.strip().startswith("use <")
+
+def compose_grid(scripts: list[str], labels: list[str], spacing: float) -> str:
+    """Combine several openscad scripts into one, placing each on a grid.
+
+    Each script becomes the body of its own module, so its assignments, modules and functions stay local.
+    `use` statements are only allowed at the top level, so they are moved there.
+    `include` statements are textual and stay in place, so included geometry is drawn once per variant.
+    """
+    assert len(scripts) == len(labels)
+    columns = math.ceil(math.sqrt(len(scripts)))
+    uses = []
+    blocks = []
+    for i, (script, label) in enumerate(zip(scripts, labels)):
+        x = (i % columns) * spacing
+        y = -(i // columns) * spacing
+        body = []
+        for line in script.splitlines():
+            if _is_use(line):
+                if line.strip() not in uses:
+                    uses.append(line.strip())
+            else:
+                body.append(line)
+        blocks.append(f"module _variant_{i}() {{\n" + "\n".join(body) + "\n}")
+        blocks.append(f"translate([{x}, {y}, 0]) _variant_{i}();")
+        blocks.append(f'translate([{x}, {y - spacing / 2}, 0]) linear_extrude(1) text({json.dumps(label, ensure_ascii=False)}, size={spacing / 10}, halign="center");')
+    return "\n".join(uses + blocks) + "\n"
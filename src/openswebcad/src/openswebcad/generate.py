@@ -44,12 +44,14 @@ class Xvfb:
 
 xvfb_context = Xvfb()
 
-async def generate_openscad(script: str, out_format: str, image_size: tuple[int, int]|None=None) -> bytes:
+async def generate_openscad(script: str, out_format: str, image_size: tuple[int, int]|None=None, view_all: bool=False) -> bytes:
     assert out_format in ("png", "stl")
     cmd = ["openscad", "-o", "-", "--export-format", out_format, "-"]
     if out_format == "png":
         assert image_size
         cmd += ["--imgsize", "{0},{1}".format(*image_size)]
+        if view_all:
+            cmd += ["--viewall", "--autocenter"]
     scad = script.encode()
     
     env = os.environ | xvfb_context.get_env()
@@ -1,14 +1,16 @@
 from typing import Any, Callable
-import base64
 import logging
 import traceback
 from contextlib import contextmanager
 
-from nicegui import ui
+from fastapi import Request, Response
+from nicegui import ui, app, run
 
 import openswebcad
+import openswebcad.gallery
 import openswebcad.generate
 import openswebcad.plugin
+import openswebcad.preview
 from openswebcad.parameters import Parameter, IntParameter, FloatParameter, ChoiceParameter
 
 def generator(model, image, parameters: list[tuple[str, Parameter , Any]]):
@@ -18,15 +20,17 @@ def generator(model, image, parameters: list[tuple[str, Parameter , Any]]):
         for name, parameter in model_parameters.items():
             print(f"{name} = {parameter}")
         png = model.generate(out_format="png", **model_parameters)
-        image_content = "data:image/png;base64," + base64.b64encode(png).decode()
-        image.source = image_content
+        image.source = Generator.preview_store.put(png)
     return generate
 
 class Generator:
     image_size: tuple[int, int] = 640, 480
+    preview_store: openswebcad.preview.PreviewStore = openswebcad.preview.MemoryPreviewStore()
+    gallery_size: int = 5
     def __init__(self, model):
         self.model = model
         self.image = None
+        self.gallery_image = None
         self.parameters: list[tuple[str, Parameter , Any]] = []
         self.logger = logging.getLogger(f"{__name__}_{model.name}_{ui.context.client.id}")
 
@@ -55,9 +59,9 @@ class Generator:
             self.logger.debug(e.stderr)
             
     
-    def generate_scad(self):
+    def generate_scad(self, **overrides):
         try:
-            return self.model.generate(**self.get_parameter_array())
+            return self.model.generate(**(self.get_parameter_array() | overrides))
         except openswebcad.IncompatibleParametersError:
             raise # propagate explicit errors
         except Exception as e:
@@ -66,8 +70,31 @@ class Generator:
     async def generate_image(self):
         try:
             png = await openswebcad.generate.generate_openscad(script=self.generate_scad(), out_format="png", image_size=self.image_size)
-            image_content = "data:image/png;base64," + base64.b64encode(png).decode()
-            self.image.source = image_content
+            self.image.source = await run.io_bound(self.preview_store.put, png)
+        except openswebcad.GenerationError as e:
+            ui.notify(str(e), type="warning")
+            self.log_error(e)
+
+    async def generate_gallery(self, name: str, spacing: float | None):
+        if spacing is None or spacing <= 0:
+            ui.notify("spacing must be a positive number", type="warning")
+            return
+        try:
+            parameter = next(p[1] for p in self.parameters if p[0] == name)
+            scripts = []
+            labels = []
+            for value in openswebcad.gallery.sweep_values(parameter, self.gallery_size):
+                try:
+                    scripts.append(self.generate_scad(**{name: value}))
+                    labels.append(f"{value:g}" if isinstance(value, float) else str(value))
+                except openswebcad.IncompatibleParametersError as e:
+                    self.logger.info(f"skipping {name} = {value}: {e}")
+            if not scripts:
+                raise openswebcad.IncompatibleParametersError([name], "no valid values")
+            self.logger.info(f"started rendering gallery of {len(scripts)} variants")
+            script = openswebcad.gallery.compose_grid(scripts, labels, spacing)
+            png = await openswebcad.generate.generate_openscad(script=script, out_format="png", image_size=self.image_size, view_all=True)
+            self.gallery_image.source = await run.io_bound(self.preview_store.put, png)
         except openswebcad.GenerationError as e:
             ui.notify(str(e), type="warning")
             self.log_error(e)
@@ -132,7 +159,16 @@ async def make_generation_page(model, gui_log):
 
             ui.button("generate STL", on_click=lambda e: with_disabled_button(e.sender, generator.generate_stl))
     
-        generator.image = ui.image().props("width={0}px height={1}px".format(*Generator.image_size))
+        generator.image = ui.image().props("width={0}px height={1}px".format(*Generator.image_size)).mark("preview")
+
+    if model.parameters:
+        with ui.expansion("gallery"):
+            with ui.row():
+                names = [p.name for p in model.parameters]
+                sweep = ui.select(names, label="parameter", value=names[0])
+                spacing = ui.number(label="spacing", value=50.0, min=1.0, format="%.1f", precision=1)
+                ui.button("render gallery", on_click=lambda e: with_disabled_button(e.sender, lambda: generator.generate_gallery(sweep.value, spacing.value)))
+            generator.gallery_image = ui.image().props("width={0}px height={1}px".format(*Generator.image_size)).mark("gallery")
 
     if gui_log:
         logger = ui.log().classes("w-full")
@@ -143,6 +179,20 @@ async def make_generation_page(model, gui_log):
     await generator.generate_image()
 
 
+@app.get(openswebcad.preview.url_prefix + "/{key}.png")
+def serve_preview(key: str, request: Request) -> Response:
+    png = Generator.preview_store.get(key)
+    if png is None:
+        return Response(status_code=404)
+    headers = {
+        "ETag": f'"{key}"',
+        "Cache-Control": "public, max-age=31536000, immutable",
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=png, media_type="image/png", headers=headers)
+
+
 def startup(gui_log: bool, models: list) -> None:
     @ui.page("/")
     async def mainpage():
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+_logger = logging.getLogger(__name__)
+
+url_prefix = "/preview"
+
+def digest(png: bytes) -> str:
+    return hashlib.sha256(png).hexdigest()
+
+def url_for(key: str) -> str:
+    return f"{url_prefix}/{key}.png"
+
+class PreviewStore(ABC):
+    """Keeps rendered preview images so they can be served under content-hashed URLs."""
+
+    @abstractmethod
+    def put(self, png: bytes) -> str:
+        """Store an image and return its URL."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Return the image for a digest, or None if it is unknown or evicted."""
+
+class MemoryPreviewStore(PreviewStore):
+    """Keeps the most recently used preview images in memory."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._images: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock() # get() is called from the request threadpool
+
+    def put(self, png: bytes) -> str:
+        key = digest(png)
+        with self._lock:
+            self._images[key] = png
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_entries:
+                evicted, _ = self._images.popitem(last=False)
+                _logger.debug(f"evicted preview {evicted}")
+        return url_for(key)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            png = self._images.get(key)
+            if png is not None:
+                self._images.move_to_end(key)
+        return png
+
+class DiskPreviewStore(PreviewStore):
+    """Keeps preview images in a directory, so several GUI processes can share them.
+
+    The modification time of a file is its last use; the oldest files are pruned every `prune_interval` writes.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1024, prune_interval: int = 32):
+        self.path = path
+        self.max_entries = max_entries
+        self.prune_interval = prune_interval
+        self._writes = 0
+        os.makedirs(path, exist_ok=True)
+
+    def _filename(self, key: str) -> str:
+        return os.path.join(self.path, key + ".png")
+
+    def put(self, png: bytes) -> str:
+        key = digest(png)
+        filename = self._filename(key)
+        try:
+            os.utime(filename)
+        except FileNotFoundError:
+            tmp = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(png)
+            os.replace(tmp, filename)
+            self._writes += 1
+            if self._writes % self.prune_interval == 0:
+                self.prune()
+        return url_for(key)
+
+    def get(self, key: str) -> bytes | None:
+        if not _is_digest(key):
+            return None
+        filename = self._filename(key)
+        try:
+            with open(filename, "rb") as f:
+                png = f.read()
+            os.utime(filename)
+        except FileNotFoundError:
+            return None
+        return png
+
+    def prune(self):
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".png"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                os.remove(path)
+                _logger.debug(f"evicted preview {path}")
+            except FileNotFoundError:
+                pass # already removed by another process
+
+def _is_digest(key: str) -> bool:
+    return len(key) == 64 and all(c in "0123456789abcdef" for c in key)
@@ -6,6 +6,7 @@ from nicegui import ui, app
 
 import openswebcad.plugin
 import openswebcad.gui
+import openswebcad.preview
 
 def parse_args():
     parser = argparse.ArgumentParser()
@@ -13,6 +14,9 @@ def parse_args():
     parser.add_argument("--native", "-n", action="store_true", help="use native GUI (window) instead of launching a webserver")
     parser.add_argument("--log", "-l", action="store_true", help="enable log output on GUI. Leaks internal information, but good for debugging")
     parser.add_argument("--xvfb", "-x", action="store_true", help="use xvfb to wrap openscad (needed on servers without running X-server)")
+    parser.add_argument("--xvfb-display", type=int, default=99, help="X display number for xvfb (must be unique per instance on one host)")
+    parser.add_argument("--port", "-p", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--preview-dir", type=str, default=None, help="store preview images in this directory instead of memory. Share it between instances running behind one reverse proxy")
     parser.add_argument("modelpath", type=str, help="the path to load plugins from")
     args = parser.parse_args()
     logging.basicConfig(level={0: logging.WARNING, 1: logging.INFO, 2: logging.DEBUG}[args.verbose])
@@ -21,6 +25,9 @@ def parse_args():
 def main():
     args = parse_args()
     openswebcad.gui.Generator.image_size = 1024, 768
+    if args.preview_dir:
+        openswebcad.gui.Generator.preview_store = openswebcad.preview.DiskPreviewStore(args.preview_dir)
+    openswebcad.generate.xvfb_context.display = args.xvfb_display
     models = openswebcad.plugin.load_models(args.modelpath)
     if len(models) == 0:
         raise RuntimeError("no models found")
@@ -28,7 +35,7 @@ def main():
     app.on_startup(lambda: openswebcad.gui.startup(gui_log=args.log, models=models))
 
     with (openswebcad.generate.xvfb_context if args.xvfb else contextlib.nullcontext()):
-        ui.run(native=args.native, reload=False)
+        ui.run(native=args.native, port=args.port, reload=False)
 
 if __name__ in {"__main__", "__mp_main__"}:
     main()
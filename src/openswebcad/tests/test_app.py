@@ -2,13 +2,15 @@ from typing import Literal, Annotated
 import asyncio
 from unittest.mock import MagicMock, patch, ANY
 
-from nicegui import ui
+import httpx
+from nicegui import ui, app
 from nicegui.testing import User
 
 from openswebcad import Range, Help
 import openswebcad.gui
 import openswebcad.parameters
 import openswebcad.plugin
+import openswebcad.preview
 
 pytest_plugins = ['nicegui.testing.user_plugin']
 
@@ -57,7 +59,7 @@ async def test_parameter_list(user: User) -> None:
 async def test_float_parameter(user: User) -> None:
     await open_test_page(user)
     with patch.object(default_models[0], "generate") as generate:
-        user.find("length").elements.pop().value=20.0
+        user.find(kind=ui.number, content="length").elements.pop().value=20.0
         await asyncio.sleep(1.0)
     generate.assert_called_once_with(length=20.0, metric=ANY, count=ANY)
 
@@ -65,7 +67,7 @@ async def test_float_parameter(user: User) -> None:
 async def test_int_parameter(user: User) -> None:
     await open_test_page(user)
     with patch.object(default_models[0], "generate") as generate:
-        user.find("count").elements.pop().value=2
+        user.find(kind=ui.number, content="count").elements.pop().value=2
         await asyncio.sleep(1.0)
     generate.assert_called_once_with(count=2, length=ANY, metric=ANY)
 
@@ -87,7 +89,7 @@ def raise_error(*args, **kwargs):
 async def test_error_propagation_on_change(user: User) -> None:
     await open_test_page(user)
     with patch.object(default_models[0], "generate", new=raise_error) as generate:
-        user.find("count").elements.pop().value=2
+        user.find(kind=ui.number, content="count").elements.pop().value=2
     #log = user.find(ui.log).elements.pop()
     await asyncio.sleep(0.3)
     await user.should_see("model generation failed")
@@ -96,12 +98,44 @@ async def test_error_propagation_on_change(user: User) -> None:
 
 async def test_preview(user: User):
     await open_test_page(user)
-    image = user.find(ui.image).elements.pop()
+    image = user.find(marker="preview").elements.pop()
     old = image.source
-    user.find("length").elements.pop().value=20.0
+    user.find(kind=ui.number, content="length").elements.pop().value=20.0
     await asyncio.sleep(1.0)
     new = image.source
     assert new != old
+    assert new.startswith("/preview/")
+
+async def test_preview_endpoint(user: User):
+    url = openswebcad.gui.Generator.preview_store.put(b"png")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get(url)
+        assert response.status_code == 200
+        assert response.content == b"png"
+        assert response.headers["content-type"] == "image/png"
+        assert "immutable" in response.headers["cache-control"]
+        etag = response.headers["etag"]
+
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        response = await client.get(openswebcad.preview.url_for("0" * 64))
+        assert response.status_code == 404
+
+async def test_gallery(user: User):
+    await open_test_page(user)
+    user.find(kind=ui.select).elements.pop().value = "metric"
+    with patch.object(default_models[0], "generate", return_value="cube(1);") as generate:
+        user.find("render gallery").click()
+        await asyncio.sleep(1.0)
+    assert [c.kwargs["metric"] for c in generate.call_args_list] == ["M4", "M6", "M8"]
+    assert user.find(marker="gallery").elements.pop().source.startswith("/preview/")
+
+async def test_gallery_invalid_spacing(user: User):
+    await open_test_page(user)
+    user.find(kind=ui.number, content="spacing").elements.pop().value = None
+    user.find("render gallery").click()
+    await user.should_see("spacing must be a positive number")
 
 async def test_generation(user: User):
     await open_test_page(user)
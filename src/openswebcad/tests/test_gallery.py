@@ -0,0 +1,46 @@
+from openswebcad.gallery import sweep_values, compose_grid
+from openswebcad.parameters import ChoiceParameter, IntParameter, FloatParameter
+
+def test_sweep_choice():
+    assert sweep_values(ChoiceParameter(name="a", choices=["x", "y", "z"]), 2) == ["x", "y", "z"]
+
+def test_sweep_int():
+    assert sweep_values(IntParameter(name="a", min_value=1, max_value=3), 5) == [1, 2, 3]
+
+def test_sweep_float():
+    assert sweep_values(FloatParameter(name="a", min_value=10.0, max_value=20.0), 3) == [10.0, 15.0, 20.0]
+
+def test_compose_grid_scopes():
+    script = compose_grid(["h=1;\ncube(h);", "h=2;\ncube(h);"], ["1", "2"], 10.0)
+
+    assert "module _variant_0() {\nh=1;\ncube(h);\n}" in script
+    assert "module _variant_1() {\nh=2;\ncube(h);\n}" in script
+    assert "translate([0.0, 0.0, 0]) _variant_0();" in script
+    assert "translate([10.0, 0.0, 0]) _variant_1();" in script
+
+def test_compose_grid_module_definitions():
+    a = "module screw(d) { cylinder(h=10, d=d); }\nfunction r(d) = d / 2;\nscrew(4);"
+    script = compose_grid([a], ["a"], 10.0)
+
+    assert script.startswith("module _variant_0() {\nmodule screw(d)")
+    assert "translate([0.0, 0.0, 0]) _variant_0();" in script
+
+def test_compose_grid_rows():
+    script = compose_grid(["cube(1);"] * 5, ["a", "b", "c", "d", "e"], 10.0)
+
+    assert "translate([0.0, -10.0, 0]) _variant_3();" in script
+    assert 'text("e"' in script
+
+def test_compose_grid_hoists_imports():
+    a = "use <MCAD/bolts.scad>\ncube(1);"
+    script = compose_grid([a, a], ["a", "b"], 10.0)
+
+    assert script.startswith("use <MCAD/bolts.scad>\nmodule _variant_0()")
+    assert script.count("use <") == 1
+
+def test_compose_grid_keeps_includes():
+    a = "include <MCAD/bolts.scad>\ncube(1);"
+    script = compose_grid([a, a], ["a", "b"], 10.0)
+
+    assert "module _variant_0() {\ninclude <MCAD/bolts.scad>\ncube(1);\n}" in script
+    assert script.count("include <") == 2
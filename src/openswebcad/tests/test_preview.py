@@ -0,0 +1,80 @@
+import os
+
+from openswebcad.preview import MemoryPreviewStore, DiskPreviewStore, digest
+
+def test_put_get():
+    store = MemoryPreviewStore()
+    url = store.put(b"png")
+
+    assert url == f"/preview/{digest(b'png')}.png"
+    assert store.get(digest(b"png")) == b"png"
+
+def test_same_content_same_url():
+    store = MemoryPreviewStore()
+
+    assert store.put(b"png") == store.put(b"png")
+
+def test_unknown_key():
+    store = MemoryPreviewStore()
+
+    assert store.get(digest(b"png")) is None
+
+def test_eviction():
+    store = MemoryPreviewStore(max_entries=2)
+    store.put(b"a")
+    store.put(b"b")
+    store.get(digest(b"a"))
+    store.put(b"c")
+
+    assert store.get(digest(b"a")) == b"a"
+    assert store.get(digest(b"b")) is None
+    assert store.get(digest(b"c")) == b"c"
+
+def test_disk_shared(tmp_path):
+    writer = DiskPreviewStore(str(tmp_path))
+    reader = DiskPreviewStore(str(tmp_path))
+    url = writer.put(b"png")
+
+    assert url == f"/preview/{digest(b'png')}.png"
+    assert reader.get(digest(b"png")) == b"png"
+
+def test_disk_invalid_key(tmp_path):
+    store = DiskPreviewStore(str(tmp_path))
+
+    assert store.get("../secret") is None
+
+def test_disk_eviction(tmp_path):
+    store = DiskPreviewStore(str(tmp_path), max_entries=2, prune_interval=3)
+    for i, content in enumerate((b"a", b"b", b"c")):
+        store.put(content)
+        os.utime(tmp_path / f"{digest(content)}.png", (i, i))
+    store.prune()
+
+    assert store.get(digest(b"a")) is None
+    assert store.get(digest(b"b")) == b"b"
+    assert store.get(digest(b"c")) == b"c"
+
+def test_disk_get_refreshes(tmp_path):
+    store = DiskPreviewStore(str(tmp_path), max_entries=2)
+    for i, content in enumerate((b"a", b"b")):
+        store.put(content)
+        os.utime(tmp_path / f"{digest(content)}.png", (i, i))
+    store.get(digest(b"a"))
+    store.put(b"c")
+    store.prune()
+
+    assert store.get(digest(b"a")) == b"a"
+    assert store.get(digest(b"b")) is None
+
+def test_disk_prune_interval(tmp_path):
+    store = DiskPreviewStore(str(tmp_path), max_entries=1, prune_interval=2)
+    store.put(b"a")
+
+    assert len(os.listdir(tmp_path)) == 1
+    store.put(b"b")
+    store.put(b"c")
+
+    assert len(os.listdir(tmp_path)) == 2
+    store.put(b"d")
+
+    assert len(os.listdir(tmp_path)) == 1